@@ -0,0 +1,100 @@
+# contour_utils.py - shared helpers for contour emission
+# Module-level so they are created once at import instead of being rebuilt
+# as closures on every emit_contour_simple call.
+from __future__ import annotations
+from functools import lru_cache
+
+# (side_token, direction_token) -> radius compensation mode.
+# Entries keyed with direction None apply regardless of direction.
+SIDE_DIR_MAP = {}
+for _s in ("left", "l", "g41", "rl"):
+    SIDE_DIR_MAP[(_s, None)] = "RL"
+for _s in ("right", "r", "g42", "rr"):
+    SIDE_DIR_MAP[(_s, None)] = "RR"
+for _s in ("inside", "inner", "in"):
+    for _d in ("cw", "clockwise"):
+        SIDE_DIR_MAP[(_s, _d)] = "RR"
+    for _d in ("ccw", "counterclockwise", "anti-clockwise", "anticlockwise"):
+        SIDE_DIR_MAP[(_s, _d)] = "RL"
+for _s in ("outside", "outer", "out"):
+    for _d in ("cw", "clockwise"):
+        SIDE_DIR_MAP[(_s, _d)] = "RL"
+    for _d in ("ccw", "counterclockwise", "anti-clockwise", "anticlockwise"):
+        SIDE_DIR_MAP[(_s, _d)] = "RR"
+del _s, _d
+
+
+def iter_op_chain(root):
+    """Yield the operation and its Base/dressup chain (cycle-safe)."""
+    cur = root
+    seen = set()
+    for _ in range(16):
+        if cur is None or id(cur) in seen:
+            break
+        seen.add(id(cur))
+        yield cur
+        cur = getattr(cur, "Base", None)
+
+
+def first_attr(chain, name):
+    """Return the first non-None attribute `name` found along `chain`."""
+    for obj in chain:
+        if hasattr(obj, name):
+            try:
+                value = getattr(obj, name)
+            except Exception:
+                continue
+            if value is not None:
+                return value
+    return None
+
+
+@lru_cache(maxsize=64)
+def _strip_lower(text: str) -> str:
+    return text.strip().lower()
+
+
+def normalize_token(value):
+    if value is None:
+        return None
+    try:
+        text = str(value)
+    except Exception:
+        return None
+    # Side/Direction come from a tiny enum-like set of strings, so the
+    # normalized form is worth memoizing.
+    return _strip_lower(text)
+
+
+def normalize_bool(value):
+    if isinstance(value, bool):
+        return value
+    token = normalize_token(value)
+    if token in ("1", "true", "yes", "y", "on"):
+        return True
+    if token in ("0", "false", "no", "n", "off"):
+        return False
+    return False
+
+
+def get_prop(obj, name):
+    if obj is None:
+        return None
+    if hasattr(obj, name):
+        try:
+            return getattr(obj, name)
+        except Exception:
+            return None
+    return None
+
+
+def to_float(value):
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except Exception:
+        try:
+            return float(str(value).split()[0])
+        except Exception:
+            return None
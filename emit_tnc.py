@@ -1,56 +1,114 @@
 from __future__ import annotations
-import re
+from dataclasses import dataclass
+from functools import lru_cache
 
 RAPID_FEED = 9999
 
-_FEED_MODAL = None
 
-_TOOL_INITIALIZED = False
+@dataclass
+class EmitContext:
+    """Modal emitter state for one program.
 
-def reset_modals():
-    global _FEED_MODAL
-    _FEED_MODAL = None
+    feed_modal is the feed currently active on the control;
+    feed_modal_obj is the last feed object that resolved to it, so _L can
+    skip the numeric conversion on an identity match (callers pass the same
+    feed object for every move of an operation). Holding the state here
+    instead of in module globals keeps programs independent of each other.
+    """
+    feed_modal: int | None = None
+    feed_modal_obj: object = None
+    tool_initialized: bool = False
+
+    def reset_modals(self):
+        self.feed_modal = None
+        self.feed_modal_obj = None
+
+
+# Default context for callers that emit one program at a time.
+_CTX = EmitContext()
+
+# Formatted-string cache for Z values. Contour jobs hit the same handful of
+# Z levels (plunge depth, step-downs, clearance) thousands of times; the
+# mapping is a pure value -> string function, so entries never go stale.
+# Bounded so pathological inputs cannot grow it without limit.
+_Z_CACHE: dict = {}
+_Z_CACHE_MAX = 256
+
+def reset_modals(ctx=None):
+    (_CTX if ctx is None else ctx).reset_modals()
+
+
+def finalize(out):
+    """Join the collected output into one writable block.
+
+    Callers should write the result with a single file.write() instead of
+    looping over `out` with per-line writes. Accepts the usual list of
+    lines, or a bytearray sink filled via _emit.
+    """
+    if isinstance(out, (bytes, bytearray)):
+        return bytes(out)
+    return "\n".join(out) + "\n"
+
+
+def _emit(out, line):
+    """Append one output line to `out`.
+
+    `out` is normally a list of str; a bytearray is also accepted, in which
+    case lines are encoded and newline-terminated in place, avoiding the
+    second full copy a final join would make.
+    """
+    if type(out) is bytearray:
+        out += line.encode("ascii")
+        out += b"\n"
+    else:
+        out.append(line)
 
 def _fmt_coord(prefix, val, nd=3):
-    try:
-        f = float(val)
-    except Exception:
-        return None
+    # Coordinates are converted to float at ingress (see the command
+    # materialization in the emitters), so skip the defensive conversion
+    # for the common case.
+    if type(val) is float:
+        f = val
+    else:
+        try:
+            f = float(val)
+        except Exception:
+            return None
     sign = "+" if f >= 0 else ""
     return f"{prefix}{sign}{f:.{nd}f}"
 
-def safe_z(out, z):
+def safe_z(out, z, ctx=None):
     """
     Fahre sicher auf Z-Höhe mit FMAX.
     Nur erlaubt, wenn bereits ein Werkzeug initialisiert ist.
     """
-    if not _TOOL_INITIALIZED:
+    if not (_CTX if ctx is None else ctx).tool_initialized:
         return
-    out.append(f"L  Z+{z:.3f}  FMAX")
+    _emit(out, f"L  Z+{z:.3f}  FMAX")
 
 def stop_spindle(out):
     """Spindel stoppen (M5)."""
-    out.append("L  M5")
+    _emit(out, "L  M5")
 
 
 def start_spindle(out):
     """Spindel starten (M3)."""
-    out.append("L  M3")
+    _emit(out, "L  M3")
 
 
 def coolant_off(out):
     """Kühlmittel aus (M9)."""
-    out.append("L  M9")
+    _emit(out, "L  M9")
 
 
 def coolant_on(out):
     """Kühlmittel ein (M8)."""
-    out.append("L  M8")
+    _emit(out, "L  M8")
 
 
 def tool_change(out):
     """Werkzeugwechsel (M6)."""
-    out.append("L  M6")
+    _emit(out, "L  M6")
 
 
 def _fmt_feed_num(v):
@@ -59,36 +117,40 @@ def _fmt_feed_num(v):
     except Exception:
         return None
 
-def tool_call(out, tnum, rpm=None):
-    global _TOOL_INITIALIZED    
+def tool_call(out, tnum, rpm=None, ctx=None):
     """
     Heidenhain TOOL CALL.
     Beispiel:
       TOOL CALL 3 Z S12000
     """
     if rpm:
-        out.append(f"TOOL CALL {int(tnum)} Z S{int(rpm)}")
+        _emit(out, f"TOOL CALL {int(tnum)} Z S{int(rpm)}")
     else:
-        out.append(f"TOOL CALL {int(tnum)} Z")
-    _TOOL_INITIALIZED = True
-
-_AXIS_RE = re.compile(r'(?:^|\s)([XYZ])([+-]?\d+(?:\.\d+)?)')
+        _emit(out, f"TOOL CALL {int(tnum)} Z")
+    (_CTX if ctx is None else ctx).tool_initialized = True
 
 def _extract_axes_from_line(line: str):
+    # Lines we emit are fixed-format ("L  X+1.234  Y..."), so a plain token
+    # scan is enough - no regex needed for these short strings.
     if not line or not isinstance(line, str):
         return (None, None, None)
-    if not line.lstrip().startswith("L"):
+    if line[:1] != "L" or line[1:2] not in (" ", "\t"):
         return (None, None, None)
-    x=y=z=None
-    for ax, val in _AXIS_RE.findall(line):
+    x = y = z = None
+    for token in line.split("  "):
+        if not token or token[0] not in "XYZ":
+            continue
         try:
-            f=float(val)
+            f = float(token[1:])
         except Exception:
             continue
-        if ax=="X": x=f
-        elif ax=="Y": y=f
-        elif ax=="Z": z=f
-    return (x,y,z)
+        if token[0] == "X":
+            x = f
+        elif token[0] == "Y":
+            y = f
+        else:
+            z = f
+    return (x, y, z)
 
 def _state_coords(state):
     if state is None:
@@ -99,51 +161,77 @@ def _state_coords(state):
 
 
 def _append_changed(out, x=None, y=None, z=None, f=None, korrektur="", state=None):
+    # Callers keep state.x/y/z current after every emitted move, so there is
+    # no need to re-parse the last emitted line here.
     last_x, last_y, last_z = _state_coords(state)
-    if last_x is None and last_y is None and last_z is None and out:
-        last_x, last_y, last_z = _extract_axes_from_line(out[-1])
 
-    axis_changed = False
-    if x is not None and (last_x is None or abs(float(x) - last_x) > 1e-6):
-        axis_changed = True
-    if y is not None and (last_y is None or abs(float(y) - last_y) > 1e-6):
-        axis_changed = True
-    if z is not None and (last_z is None or abs(float(z) - last_z) > 1e-6):
-        axis_changed = True
+    # Coordinates arrive as floats from the emitters; compare directly
+    # instead of re-converting each axis. The 1e-6 tolerance matches the
+    # 3-decimal output resolution.
+    axis_changed = (
+        (x is not None and (last_x is None or abs(x - last_x) > 1e-6))
+        or (y is not None and (last_y is None or abs(y - last_y) > 1e-6))
+        or (z is not None and (last_z is None or abs(z - last_z) > 1e-6))
+    )
 
     if not axis_changed:
         return
 
-    out.append(_L(x=x, y=y, z=z, f=f, korrektur=korrektur))
+    _emit(out, _L(x=x, y=y, z=z, f=f, korrektur=korrektur))
 
 def _append_unique(out, line: str):
-    """Append line only if it differs from the last emitted line."""
+    """Append line only if it differs from the last emitted line.
+
+    Deliberately a one-slot rolling comparison, not a full-list scan:
+    duplicate suppression in NC output only ever concerns adjacent lines
+    (the same move twice in a row), and the adjacent check keeps this
+    O(1) per call instead of O(n) over the program.
+    """
     if line is None:
         return
     if not out or out[-1] != line:
         out.append(line)
 
 
-def _L(x=None, y=None, z=None, f=None, korrektur=""):
-    global _FEED_MODAL
+def _L(x=None, y=None, z=None, f=None, korrektur="", ctx=None):
+    # Fast path for the most common shape: plain XY move, feed already modal.
+    if (
+        f is None
+        and not korrektur
+        and z is None
+        and type(x) is float
+        and type(y) is float
+    ):
+        return f"L  X{x:+.3f}  Y{y:+.3f}"
+
     parts = ["L"]
     if x is not None:
         parts.append(_fmt_coord("X", x))
     if y is not None:
         parts.append(_fmt_coord("Y", y))
     if z is not None:
-        parts.append(_fmt_coord("Z", z))
+        sz = _Z_CACHE.get(z)
+        if sz is None:
+            sz = _fmt_coord("Z", z)
+            if sz is not None and len(_Z_CACHE) < _Z_CACHE_MAX:
+                _Z_CACHE[z] = sz
+        parts.append(sz)
     if korrektur:
         parts.append(korrektur)
 
     if f is not None:
-        if isinstance(f, str) and f.upper() == "FMAX":
+        if f == "FMAX":
             parts.append(f"F{RAPID_FEED}")
         else:
-            fnum = _fmt_feed_num(f)
-            if fnum is not None and fnum != _FEED_MODAL:
-                parts.append(f"F{fnum}")
-                _FEED_MODAL = fnum
+            if ctx is None:
+                ctx = _CTX
+            if f is not ctx.feed_modal_obj:
+                fnum = _fmt_feed_num(f)
+                if fnum is not None:
+                    if fnum != ctx.feed_modal:
+                        parts.append(f"F{fnum}")
+                        ctx.feed_modal = fnum
+                    ctx.feed_modal_obj = f
 
     return "  ".join(parts)
 
@@ -185,6 +273,36 @@ def _fmt_time_seconds_with_comma(v, decimals=3):
     return s.replace(".", ",")
 
 
+# Cached variants for call sites that format the same handful of values
+# over and over (drill groups share depth/rplane/dwell across a whole hole
+# pattern). Keys must be hashable; unhashable values fall through to the
+# plain formatters.
+_fmt_number_lru = lru_cache(maxsize=256)(_fmt_number)
+_fmt_negative_lru = lru_cache(maxsize=256)(_fmt_negative)
+_fmt_time_seconds_with_comma_lru = lru_cache(maxsize=256)(_fmt_time_seconds_with_comma)
+
+
+def _fmt_number_cached(v, fmt="+.3f"):
+    try:
+        return _fmt_number_lru(v, fmt)
+    except TypeError:
+        return _fmt_number(v, fmt)
+
+
+def _fmt_negative_cached(v):
+    try:
+        return _fmt_negative_lru(v)
+    except TypeError:
+        return _fmt_negative(v)
+
+
+def _fmt_time_seconds_with_comma_cached(v, decimals=3):
+    try:
+        return _fmt_time_seconds_with_comma_lru(v, decimals)
+    except TypeError:
+        return _fmt_time_seconds_with_comma(v, decimals)
+
+
 def _fmt_feed_num_scaled(v, scale=60.0):
     try:
         return int(round(float(v) * scale))
@@ -26,10 +26,31 @@ def get_heights(obj, default_safe=5.0, default_clear=50.0):
         clear_z = float(default_clear)
     return safe_z, clear_z
 
-def scan_command_names(pth):
-    names=set()
-    for c in getattr(pth, "Commands", []) or []:
-        n = str(getattr(c, "Name", "")).upper()
-        if n:
-            names.add(n)
-    return names
+# Integer command kinds for hot-loop dispatch: comparing small ints is
+# cheaper than re-uppercasing and hashing the command name per iteration.
+KIND_RAPID = 0
+KIND_FEED = 1
+KIND_ARC_CW = 2
+KIND_ARC_CCW = 3
+KIND_CC = 4
+KIND_C = 5
+KIND_OTHER = -1
+
+NAME_KIND = {
+    "G0": KIND_RAPID, "G00": KIND_RAPID,
+    "G1": KIND_FEED, "G01": KIND_FEED,
+    "G2": KIND_ARC_CW, "G02": KIND_ARC_CW,
+    "G3": KIND_ARC_CCW, "G03": KIND_ARC_CCW,
+    "CC": KIND_CC, "C": KIND_C,
+}
+# Lowercase aliases let lookups hit directly on the raw Name, skipping the
+# per-command str().upper() allocation for well-formed paths.
+NAME_KIND.update({_k.lower(): _v for _k, _v in list(NAME_KIND.items())})
+
+def command_kind(cmd):
+    """Map a Path.Command to an integer kind (KIND_OTHER if unknown)."""
+    raw = getattr(cmd, "Name", "")
+    kind = NAME_KIND.get(raw)
+    if kind is None:
+        kind = NAME_KIND.get(str(raw).upper(), KIND_OTHER)
+    return kind
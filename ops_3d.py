@@ -1,11 +1,12 @@
 from __future__ import annotations
 from emit_tnc import _append_changed, _CC, _C
+from fc_adapter import command_kind, KIND_RAPID, KIND_FEED, KIND_CC, KIND_C
 
 def emit_3d(out, state, tooldb, heights, pth):
     for cmd in getattr(pth, "Commands", []) or []:
-        n = str(getattr(cmd, "Name", "")).upper()
-        p = getattr(cmd, "Parameters", {}) or {}
-        if n in ("G0","G00"):
+        kind = command_kind(cmd)
+        if kind == KIND_RAPID:
+            p = getattr(cmd, "Parameters", {}) or {}
             _append_changed(out, x=p.get("X"), y=p.get("Y"), z=p.get("Z"), f="FMAX", state=state)
             if p.get("X") is not None:
                 state.x = p.get("X")
@@ -13,7 +14,8 @@ def emit_3d(out, state, tooldb, heights, pth):
                 state.y = p.get("Y")
             if p.get("Z") is not None:
                 state.z = p.get("Z")
-        elif n in ("G1","G01"):
+        elif kind == KIND_FEED:
+            p = getattr(cmd, "Parameters", {}) or {}
             _append_changed(out, x=p.get("X"), y=p.get("Y"), z=p.get("Z"), f=p.get("F"), state=state)
             if p.get("X") is not None:
                 state.x = p.get("X")
@@ -21,7 +23,14 @@ def emit_3d(out, state, tooldb, heights, pth):
                 state.y = p.get("Y")
             if p.get("Z") is not None:
                 state.z = p.get("Z")
-        elif n == "CC":
-            out.append(_CC(p.get("X"), p.get("Y")))
-        elif n == "C":
+        elif kind == KIND_CC:
+            p = getattr(cmd, "Parameters", {}) or {}
+            cc = (p.get("X"), p.get("Y"))
+            if state.last_cc != cc:
+                out.append(_CC(cc[0], cc[1]))
+                state.last_cc = cc
+        elif kind == KIND_C:
+            p = getattr(cmd, "Parameters", {}) or {}
+            # C at the current position is a full circle on the control, so
+            # a repeated C line is real motion and must never be deduped.
             out.append(_C(p.get("X"), p.get("Y"), cw=bool(p.get("DR", True))))
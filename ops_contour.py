@@ -4,14 +4,33 @@
 
 from typing import List, Any
 from emit_tnc import _append_changed, _CC, _C
+from fc_adapter import (
+    NAME_KIND,
+    KIND_RAPID,
+    KIND_FEED,
+    KIND_ARC_CW,
+    KIND_ARC_CCW,
+    KIND_OTHER,
+)
+from contour_utils import (
+    SIDE_DIR_MAP,
+    iter_op_chain,
+    first_attr,
+    normalize_token,
+    normalize_bool,
+    get_prop,
+    to_float,
+)
 
 
 # Set to True to include DEBUG comments in emitted NC output.
 CONTOUR_DEBUG = False
 
 
+
 def _append_debug(out: List[str], message: str) -> None:
-    if CONTOUR_DEBUG:
+    # __debug__ lets python -O fold the whole branch away at compile time.
+    if __debug__ and CONTOUR_DEBUG:
         out.append(f"(DEBUG {message})")
 
 
@@ -36,176 +55,116 @@ def emit_contour_simple(
     - rapid moves use FMAX
     """
 
-    def _iter_op_chain(root):
-        cur = root
-        seen = set()
-        for _ in range(16):
-            if cur is None or id(cur) in seen:
-                break
-            seen.add(id(cur))
-            yield cur
-            cur = getattr(cur, "Base", None)
-
-    def _get_op_attr(root, name):
-        for obj in _iter_op_chain(root):
-            if hasattr(obj, name):
-                try:
-                    value = getattr(obj, name)
-                except Exception:
-                    continue
-                if value is not None:
-                    return value
-        return None
-
-    def _normalize_token(value):
-        if value is None:
-            return None
-        try:
-            text = str(value)
-        except Exception:
-            return None
-        return text.strip().lower()
-
-    def _normalize_bool(value):
-        if isinstance(value, bool):
-            return value
-        token = _normalize_token(value)
-        if token in ("1", "true", "yes", "y", "on"):
-            return True
-        if token in ("0", "false", "no", "n", "off"):
-            return False
-        return False
-
-    def _get_prop(obj, name):
-        if obj is None:
-            return None
-        if hasattr(obj, name):
-            try:
-                return getattr(obj, name)
-            except Exception:
-                return None
-        return None
-
-    def _to_float(value):
-        if value is None:
-            return None
-        try:
-            return float(value)
-        except Exception:
-            try:
-                return float(str(value).split()[0])
-            except Exception:
-                return None
-
-    def _is_linear_move(cmd_name):
-        return cmd_name in ("G0", "G00", "G1", "G01")
-
-    def _is_arc_move(cmd_name):
-        return cmd_name in ("G2", "G02", "G3", "G03")
-
-    def _get_xy(params):
-        x = _to_float(params.get("X"))
-        y = _to_float(params.get("Y"))
-        return x, y
-
-    use_comp = _get_op_attr(op, "UseComp")
-    side = _get_op_attr(op, "Side")
-    direction = _get_op_attr(op, "Direction")
-    _append_debug(
-        out,
-        f"UseComp={use_comp!r} type={type(use_comp).__name__} | "
-        f"Side={side!r} type={type(side).__name__} | "
-        f"Direction={direction!r} type={type(direction).__name__}",
-    )
+    # Resolve the Base/dressup chain once; every attribute lookup below walks
+    # this cached list instead of re-traversing the chain.
+    op_chain = list(iter_op_chain(op))
+
+    # Materialize (kind, x, y, z, i, j) once; every scan below runs on this
+    # flat list instead of re-reading Path.Command attributes per pass. The
+    # kind is an integer (see fc_adapter.NAME_KIND) so the loops below
+    # dispatch on int compares, and the coordinates are unpacked from the
+    # tuple instead of hashed out of the Parameters dict per visit.
+    cmds = []
+    # Bind bound methods/globals as locals once; CPython resolves locals
+    # much faster than attribute or global lookups in a tight loop.
+    cmds_append = cmds.append
+    kind_get = NAME_KIND.get
+    for c in commands:
+        p = getattr(c, "Parameters", {}) or {}
+        raw = getattr(c, "Name", "")
+        kind = kind_get(raw)
+        if kind is None:
+            kind = kind_get(str(raw).upper(), KIND_OTHER)
+        cmds_append(
+            (
+                kind,
+                to_float(p.get("X")),
+                to_float(p.get("Y")),
+                to_float(p.get("Z")),
+                to_float(p.get("I")),
+                to_float(p.get("J")),
+            )
+        )
 
-    use_comp_bool = _normalize_bool(use_comp)
-    side_token = _normalize_token(side)
-    direction_token = _normalize_token(direction)
+    use_comp = first_attr(op_chain, "UseComp")
+    side = first_attr(op_chain, "Side")
+    direction = first_attr(op_chain, "Direction")
+    if __debug__ and CONTOUR_DEBUG:
+        _append_debug(
+            out,
+            f"UseComp={use_comp!r} type={type(use_comp).__name__} | "
+            f"Side={side!r} type={type(side).__name__} | "
+            f"Direction={direction!r} type={type(direction).__name__}",
+        )
+
+    use_comp_bool = normalize_bool(use_comp)
+    side_token = normalize_token(side)
+    direction_token = normalize_token(direction)
 
     radius_mode = "R0"
     if not use_comp_bool:
-        if side_token in ("left", "l", "g41", "rl"):
-            radius_mode = "RL"
-        elif side_token in ("right", "r", "g42", "rr"):
-            radius_mode = "RR"
-        elif side_token in ("inside", "inner", "in"):
-            if direction_token in ("cw", "clockwise"):
-                radius_mode = "RR"
-            elif direction_token in ("ccw", "counterclockwise", "anti-clockwise", "anticlockwise"):
-                radius_mode = "RL"
-        elif side_token in ("outside", "outer", "out"):
-            if direction_token in ("cw", "clockwise"):
-                radius_mode = "RL"
-            elif direction_token in ("ccw", "counterclockwise", "anti-clockwise", "anticlockwise"):
-                radius_mode = "RR"
+        radius_mode = SIDE_DIR_MAP.get(
+            (side_token, direction_token)
+        ) or SIDE_DIR_MAP.get((side_token, None), "R0")
 
+    # One forward pass finds the plunge, the entry move after it, and whether
+    # a lead-in (linear XY move up to and including the plunge) exists.
     plunge_index = None
-    for idx, cmd in enumerate(commands):
-        name = str(getattr(cmd, "Name", "")).upper()
-        if name not in ("G0", "G00", "G1", "G01"):
-            continue
-        p = getattr(cmd, "Parameters", {}) or {}
-        z = _to_float(p.get("Z"))
-        if z is not None and z < 0:
-            plunge_index = idx
-            break
-
     entry_index = None
     lead_in = False
-    if plunge_index is not None:
-        for idx, cmd in enumerate(commands[plunge_index + 1 :], start=plunge_index + 1):
-            name = str(getattr(cmd, "Name", "")).upper()
-            if name not in ("G0", "G00", "G1", "G01"):
-                continue
-            p = getattr(cmd, "Parameters", {}) or {}
-            if p.get("X") is not None or p.get("Y") is not None:
-                entry_index = idx
-                break
-        if entry_index is not None:
-            lead_in = any(
-                str(getattr(cmd, "Name", "")).upper() in ("G0", "G00", "G1", "G01")
-                and (
-                    (getattr(cmd, "Parameters", {}) or {}).get("X") is not None
-                    or (getattr(cmd, "Parameters", {}) or {}).get("Y") is not None
-                )
-                for cmd in commands[:entry_index]
+    for idx, (kind, x, y, z, _i, _j) in enumerate(cmds):
+        if kind != KIND_RAPID and kind != KIND_FEED:
+            continue
+        if plunge_index is None:
+            if x is not None or y is not None:
+                lead_in = True
+            if z is not None and z < 0:
+                plunge_index = idx
+        elif x is not None or y is not None:
+            entry_index = idx
+            break
+    if entry_index is None:
+        lead_in = False
+
+    # The RND radius (and with it the whole tool-diameter lookup) only
+    # matters for RL/RR compensation; skip the attribute walk for plain R0.
+    rnd_radius = 0.0
+    if radius_mode in ("RL", "RR"):
+        tool_diam = None
+        tool_controller = first_attr(op_chain, "ToolController")
+        if tool_controller is not None:
+            tool = (
+                get_prop(tool_controller, "Tool")
+                or get_prop(tool_controller, "Toolbit")
+                or get_prop(tool_controller, "ToolBit")
+            )
+            tool_diam = (
+                get_prop(tool, "Diameter")
+                or get_prop(tool, "ToolDiameter")
+                or get_prop(tool, "Diam")
+            )
+        if tool_diam is None:
+            tool_diam = (
+                first_attr(op_chain, "Diameter")
+                or first_attr(op_chain, "ToolDiameter")
+                or first_attr(op_chain, "Diam")
             )
 
-    tool_diam = None
-    tool_controller = _get_op_attr(op, "ToolController")
-    if tool_controller is not None:
-        tool = (
-            _get_prop(tool_controller, "Tool")
-            or _get_prop(tool_controller, "Toolbit")
-            or _get_prop(tool_controller, "ToolBit")
-        )
-        tool_diam = (
-            _get_prop(tool, "Diameter")
-            or _get_prop(tool, "ToolDiameter")
-            or _get_prop(tool, "Diam")
-        )
-    if tool_diam is None:
-        tool_diam = (
-            _get_op_attr(op, "Diameter")
-            or _get_op_attr(op, "ToolDiameter")
-            or _get_op_attr(op, "Diam")
-        )
-
-    tool_diam_mm = _to_float(tool_diam)
-    tool_radius = tool_diam_mm / 2.0 if tool_diam_mm else 0.0
-    rnd_radius = round(max(1.05 * tool_radius, tool_radius + 0.5), 1)
+        tool_diam_mm = to_float(tool_diam)
+        tool_radius = tool_diam_mm / 2.0 if tool_diam_mm else 0.0
+        rnd_radius = round(max(1.05 * tool_radius, tool_radius + 0.5), 1)
 
-    _append_debug(out, f"LeadIn={lead_in}")
-    _append_debug(out, f"EntryIndex={entry_index}")
-    _append_debug(out, f"RND_RADIUS={rnd_radius}")
-    _append_debug(out, f"RADIUS_MODE={radius_mode}")
+    if __debug__ and CONTOUR_DEBUG:
+        _append_debug(out, f"LeadIn={lead_in}")
+        _append_debug(out, f"EntryIndex={entry_index}")
+        _append_debug(out, f"RND_RADIUS={rnd_radius}")
+        _append_debug(out, f"RADIUS_MODE={radius_mode}")
 
     if radius_mode in ("RL", "RR") and (not lead_in or entry_index is None):
         out.append("(ERROR: RL/RR requires Lead-In)")
         out.append("(Contour aborted)")
         return
 
-    rnd_emitted = False
     replace_leadin_arc_index = None
     if (
         not use_comp_bool
@@ -214,51 +173,81 @@ def emit_contour_simple(
         and entry_index is not None
         and entry_index > 0
     ):
-        candidate = commands[entry_index - 1]
-        candidate_name = str(getattr(candidate, "Name", "")).upper()
-        if candidate_name in ("G2", "G02", "G3", "G03"):
-            candidate_params = getattr(candidate, "Parameters", {}) or {}
-            if candidate_params.get("X") is not None or candidate_params.get("Y") is not None:
+        candidate_kind, candidate_x, candidate_y, _cz, _ci, _cj = cmds[entry_index - 1]
+        if candidate_kind in (KIND_ARC_CW, KIND_ARC_CCW):
+            if candidate_x is not None or candidate_y is not None:
                 replace_leadin_arc_index = entry_index - 1
+
+    _emit_contour_body(
+        out,
+        cmds,
+        state,
+        feed_xy,
+        feed_z,
+        entry_index,
+        radius_mode,
+        rnd_radius,
+        replace_leadin_arc_index,
+    )
+
+
+def _emit_contour_body(
+    out,
+    cmds,
+    state,
+    feed_xy,
+    feed_z,
+    entry_index,
+    radius_mode,
+    rnd_radius,
+    replace_leadin_arc_index,
+):
+    """Inner emit loop over the materialized command list.
+
+    Kept as a free function over flat tuples and locals only, so the hottest
+    loop stays self-contained and compiler-friendly.
+    """
+    comp_active = radius_mode in ("RL", "RR")
+    rnd_emitted = False
     leadin_arc_replaced = False
 
-    for idx, cmd in enumerate(commands):
-        name = str(getattr(cmd, "Name", "")).upper()
-        p = getattr(cmd, "Parameters", {}) or {}
+    # Local bindings for names hit on every iteration (bound-method /
+    # global lookups are slower than locals in CPython).
+    out_append = out.append
+    append_changed = _append_changed
+
+    for idx, (kind, x, y, z, cx, cy) in enumerate(cmds):
         phase_before_entry = entry_index is not None and idx < entry_index
         phase_entry = entry_index is not None and idx == entry_index
 
         # ----------------------------
         # Linear moves (rapid / feed)
         # ----------------------------
-        if name in ("G0", "G00", "G1", "G01"):
-            x = p.get("X")
-            y = p.get("Y")
-            z = p.get("Z")
-            rapid = name in ("G0", "G00")
+        if kind == KIND_RAPID or kind == KIND_FEED:
+            rapid = kind == KIND_RAPID
 
-            # Z move first
+            # Z move first (kept separate from XY: Z runs at feed_z).
+            # _append_changed already suppresses unchanged coordinates.
             if z is not None:
-                if state.z is None or abs(state.z - z) > 1e-9:
-                    _append_changed(
-                        out,
-                        z=z,
-                        f="FMAX" if rapid else feed_z,
-                        state=state,
-                    )
-                    state.z = z
+                append_changed(
+                    out,
+                    z=z,
+                    f="FMAX" if rapid else feed_z,
+                    state=state,
+                )
+                state.z = z
 
             # XY move
             if x is not None or y is not None:
                 comp = ""
                 if phase_before_entry:
                     comp = "R0"
-                elif phase_entry and radius_mode in ("RL", "RR") and not leadin_arc_replaced:
+                elif phase_entry and comp_active and not leadin_arc_replaced:
                     if not rnd_emitted:
-                        out.append(f"RND R{rnd_radius:.1f}")
+                        out_append(f"RND R{rnd_radius:.1f}")
                         rnd_emitted = True
                     comp = radius_mode
-                _append_changed(
+                append_changed(
                     out,
                     x=x,
                     y=y,
@@ -274,27 +263,22 @@ def emit_contour_simple(
         # ----------------------------
         # Arc moves (G2 / G3)
         # ----------------------------
-        elif name in ("G2", "G02", "G3", "G03"):
+        elif kind == KIND_ARC_CW or kind == KIND_ARC_CCW:
             # optional Z before arc
-            z = p.get("Z")
             if z is not None:
-                if state.z is None or abs(state.z - z) > 1e-9:
-                    _append_changed(out, z=z, f=feed_z, state=state)
-                    state.z = z
+                append_changed(out, z=z, f=feed_z, state=state)
+                state.z = z
 
             # arc center + end point
-            cx = p.get("I")
-            cy = p.get("J")
-            x = p.get("X")
-            y = p.get("Y")
-            cw = name in ("G2", "G02")
+            cw = kind == KIND_ARC_CW
 
             if idx == replace_leadin_arc_index:
-                _append_debug(out, "replaced lead-in arc with L at contour start for RL/RR")
+                if __debug__ and CONTOUR_DEBUG:
+                    _append_debug(out, "replaced lead-in arc with L at contour start for RL/RR")
                 if not rnd_emitted:
-                    out.append(f"RND R{rnd_radius:.1f}")
+                    out_append(f"RND R{rnd_radius:.1f}")
                     rnd_emitted = True
-                _append_changed(
+                append_changed(
                     out,
                     x=x,
                     y=y,
@@ -307,9 +291,15 @@ def emit_contour_simple(
                 leadin_arc_replaced = True
                 continue
 
-            if cx is not None and cy is not None:
-                out.append(_CC(cx, cy))
-            out.append(_C(x, y, cw=cw))
+            # CC is modal: only re-emit the center when it changes, and drop
+            # degenerate repeated arcs entirely.
+            if cx is not None and cy is not None and state.last_cc != (cx, cy):
+                out_append(_CC(cx, cy))
+                state.last_cc = (cx, cy)
+            # Never dedup C lines: C at the current position is the
+            # full-circle command, so a repeated C is real motion (spring
+            # pass, helix floor), not a redundant repeat.
+            out_append(_C(x, y, cw=cw))
 
             state.x = x
             state.y = y
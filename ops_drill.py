@@ -12,38 +12,108 @@ Therefore we only use absolute imports (same-folder modules) and rely on the ent
 script (tnc355_post.py) to place this folder on sys.path.
 """
 
+import re
+import sys
 from typing import Any, Dict, List, Optional, Tuple
 
 from emit_tnc import (
+    RAPID_FEED,
     _L,
     _append_unique,
-    _fmt_number,
-    _fmt_negative,
-    _fmt_time_seconds_with_comma,
+    _fmt_number_cached,
+    _fmt_negative_cached,
+    _fmt_time_seconds_with_comma_cached,
     _fmt_feed_num_scaled,
 )
 
 
+# Canonical (interned) uppercase forms of the names we handle; hitting this
+# table on the raw Name avoids the per-command str().upper() allocation and
+# makes the set lookups below pointer-equality fast.
+_CANON = {}
+for _n in ("G0", "G00", "G1", "G01", "G80", "G81", "G82", "G83", "G90", "G98"):
+    _CANON[_n] = sys.intern(_n)
+    _CANON[_n.lower()] = _CANON[_n]
+del _n
+
+# O(1) membership check for wrapper comments / modal noise.
+_IGNORE = frozenset(("(DRILLING)", "(BEGIN DRILLING)", "G90", "G98"))
+
+# Integer opcodes for the per-command dispatch: the loop compares small
+# ints instead of strings against frozensets (contour already dispatches
+# on fc_adapter's integer kinds the same way). Cycle opcodes equal the
+# G number, so they double as the grouping-key kind id.
+_OP_RAPID = 0
+_OP_FEED = 1
+_OP_CANCEL = 80
+_OP = {
+    "G0": _OP_RAPID, "G00": _OP_RAPID,
+    "G1": _OP_FEED, "G01": _OP_FEED,
+    "G80": _OP_CANCEL,
+    "G81": 81, "G82": 82, "G83": 83,
+}
+_OP.update({_k.lower(): _v for _k, _v in list(_OP.items())})
+
+# Parsers for Path.toGCode() output: one G/M word followed by parameter
+# words on the same line (separators must not cross line ends).
+_GCODE_CMD_RE = re.compile(r"(?m)^[ \t]*([GM]\d+)((?:[ \t]+[A-Z][-+0-9.]+)*)")
+_GCODE_PARAM_RE = re.compile(r"([A-Z])([-+]?[0-9]*\.?[0-9]+)")
+
+
+def _iter_name_params(pth):
+    """Yield (NAME, params) for every command of the path.
+
+    Prefers a single pth.toGCode() call - the whole path crosses the
+    Python/C++ boundary once as a string - and parses it with compiled
+    regexes. Paths (or stand-ins) without toGCode fall back to per-command
+    attribute access on Commands.
+    """
+    try:
+        gcode = pth.toGCode()
+    except Exception:
+        gcode = None
+    if isinstance(gcode, str) and gcode:
+        for m in _GCODE_CMD_RE.finditer(gcode):
+            par = {a: float(v) for a, v in _GCODE_PARAM_RE.findall(m.group(2))}
+            yield m.group(1), par
+        return
+    for cmd in getattr(pth, "Commands", []) or []:
+        raw = getattr(cmd, "Name", "")
+        name = _CANON.get(raw) or str(raw).upper()
+        # Parameters is only read, never mutated - no need to copy the dict.
+        yield name, getattr(cmd, "Parameters", {}) or {}
+
+
 def _warn(out: List[str], msg: str) -> None:
     # Heidenhain comments are fine for diagnostics.
     out.append(f"; WARN: {msg}")
 
 
-def _dg_key(kind: str, depth: Any, rplane: Any, feed: Any, dwell: Any, peck: Any) -> Tuple:
-    """Create a stable grouping key for drilling cycles."""
-    def _q(v: Any, nd: int = 6):
-        try:
-            return round(float(v), nd)
-        except Exception:
-            return v
+def _ticks(v: Any):
+    """Quantize a numeric value to integer micrometre ticks for grouping.
 
+    Ints hash faster than rounded floats and sidestep round() corner cases;
+    None and non-numerics pass through unchanged.
+    """
+    if type(v) is float:
+        return int(round(v * 1e6))
+    if v is None:
+        return None
+    try:
+        return int(round(float(v) * 1e6))
+    except Exception:
+        return v
+
+
+def _dg_key(op: int, depth: Any, rplane: Any, feed: Any, dwell: Any, peck: Any) -> Tuple:
+    """Create a stable grouping key for drilling cycles (op is the _OP code)."""
     return (
-        str(kind).upper(),
-        _q(depth),
-        _q(rplane),
-        _q(feed),
-        _q(dwell),
-        _q(peck),
+        op,
+        _ticks(depth),
+        _ticks(rplane),
+        _ticks(feed),
+        _ticks(dwell),
+        _ticks(peck),
     )
 
 
@@ -56,9 +126,10 @@ def _emit_cycle_def(out: List[str], dg: Dict[str, Any]) -> None:
     dwell = dg.get("dwell", 0) or 0
     peck = dg.get("peck", None)
 
-    # Convert to strings with correct decimal and sign conventions
-    abst = _fmt_negative(rplane)  # ABST uses negative sign in your preferred output
-    tiefe = _fmt_number(depth, "+.3f")
+    # Convert to strings with correct decimal and sign conventions; cached
+    # formatters because consecutive groups mostly share these values.
+    abst = _fmt_negative_cached(rplane)  # ABST uses negative sign in your preferred output
+    tiefe = _fmt_number_cached(depth, "+.3f")
 
     # Feed: FreeCAD usually provides mm/s, we scale to mm/min like emit_tnc does.
     fnum = _fmt_feed_num_scaled(feed)
@@ -66,20 +137,19 @@ def _emit_cycle_def(out: List[str], dg: Dict[str, Any]) -> None:
         fnum = 60
 
     # Dwell format with comma
-    vzeit = _fmt_time_seconds_with_comma(dwell)
-
-    out.append("CYCL DEF 1.0 TIEFBOHREN")
-    out.append(f"CYCL DEF 1.1 ABST {abst}")
-    out.append(f"CYCL DEF 1.2 TIEFE {tiefe}")
-    if peck is not None:
-        out.append(f"CYCL DEF 1.3 ZUSTLG {_fmt_negative(peck)}")
-    else:
-        out.append(f"CYCL DEF 1.3 ZUSTLG {tiefe}")
-    if kind == "G82":
-        out.append(f"CYCL DEF 1.4 VZEIT {vzeit}")
-    else:
-        out.append("CYCL DEF 1.4 VZEIT 0,000")
-    out.append(f"CYCL DEF 1.5 F {fnum}")
+    vzeit = _fmt_time_seconds_with_comma_cached(dwell)
+
+    zustlg = _fmt_negative_cached(peck) if peck is not None else tiefe
+    out.extend(
+        (
+            "CYCL DEF 1.0 TIEFBOHREN",
+            f"CYCL DEF 1.1 ABST {abst}",
+            f"CYCL DEF 1.2 TIEFE {tiefe}",
+            f"CYCL DEF 1.3 ZUSTLG {zustlg}",
+            f"CYCL DEF 1.4 VZEIT {vzeit}" if kind == "G82" else "CYCL DEF 1.4 VZEIT 0,000",
+            f"CYCL DEF 1.5 F {fnum}",
+        )
+    )
 
 
 def _flush_drill_group(out: List[str], dg: Dict[str, Any]) -> None:
@@ -93,10 +163,24 @@ def _flush_drill_group(out: List[str], dg: Dict[str, Any]) -> None:
         return
 
     _emit_cycle_def(out, dg)
+    # Build the point block locally and extend once instead of two bound
+    # out.append calls per hole. The feed is fixed (FMAX) for the whole
+    # group, so format the line directly instead of going through _L's
+    # keyword dispatch; the f-string below must stay in sync with what
+    # _L(x=x, y=y, f="FMAX") produces. Non-float points fall back to _L.
+    block = []
+    last = out[-1] if out else None
     for (x, y) in pts:
         # Rapid to XY, then cycle call
-        _append_unique(out, _L(x=x, y=y, f="FMAX"))
-        out.append("CYCL CALL")
+        if type(x) is float and type(y) is float:
+            line = f"L  X{x:+.3f}  Y{y:+.3f}  F{RAPID_FEED}"
+        else:
+            line = _L(x=x, y=y, f="FMAX")
+        if line is not None and line != last:
+            block.append(line)
+        block.append("CYCL CALL")
+        last = "CYCL CALL"
+    out.extend(block)
 
     dg["active"] = False
     dg["pts"] = []
@@ -120,38 +204,51 @@ def _emit_literal_with_drill_grouping(out: List[str], pth, state: Any, peck=None
 
     dg: Dict[str, Any] = {"active": False}
 
-    for cmd in getattr(pth, "Commands", []) or []:
-        name = str(getattr(cmd, "Name", "")).upper()
-        par = dict(getattr(cmd, "Parameters", {}) or {})
-
-        # ignore wrappers / modal noise
-        if name in ("(DRILLING)", "(BEGIN DRILLING)", "G90", "G98"):
-            continue
-
-        if name == "G80":
+    # Track the modal position in locals; dict access per command is ~4x
+    # slower in CPython. Written back once after the loop.
+    sx = state["X"]
+    sy = state["Y"]
+    sz = state["Z"]
+
+    for name, par in _iter_name_params(pth):
+        # One dict lookup maps the name to a small-int opcode; the branch
+        # tests below are then plain int compares.
+        op = _OP.get(name)
+        if op is None:
+            # ignore wrappers / modal noise
+            if name in _IGNORE:
+                continue
+            op = -1
+
+        if op == _OP_CANCEL:
             if peck is not None:
                 dg["peck"] = peck
             _flush_drill_group(out, dg)
             continue
 
-        X = par.get("X", state.get("X"))
-        Y = par.get("Y", state.get("Y"))
-        Z = par.get("Z", state.get("Z"))
+        # One dict lookup per axis; the modal fallback is a local, and the
+        # cycle branch below reuses these values instead of re-querying.
+        x_par = par.get("X")
+        y_par = par.get("Y")
+        z_par = par.get("Z")
+        X = x_par if x_par is not None else sx
+        Y = y_par if y_par is not None else sy
+        Z = z_par if z_par is not None else sz
         F = par.get("F", None)
 
-        if name in ("G0", "G00"):
+        if op == _OP_RAPID:
             _append_unique(out, _L(x=X, y=Y, z=Z, f="FMAX"))
 
-        elif name in ("G1", "G01"):
+        elif op == _OP_FEED:
             out.append(_L(x=X, y=Y, z=Z, f=F))
 
-        elif name in ("G81", "G82", "G83"):
-            depth = par.get("Z", -5.0)
+        elif op >= 81:
+            depth = z_par if z_par is not None else -5.0
             rplane = par.get("R", 2.0)
-            feed = par.get("F", 80)
-            dwell = par.get("P", 0.0) if name == "G82" else 0.0
+            feed = F if F is not None else 80
+            dwell = par.get("P", 0.0) if op == 82 else 0.0
 
-            key = _dg_key(name, depth, rplane, feed, dwell, peck)
+            key = _dg_key(op, depth, rplane, feed, dwell, peck)
             if (not dg.get("active")) or dg.get("key") != key:
                 if peck is not None:
                     dg["peck"] = peck
@@ -170,7 +267,7 @@ def _emit_literal_with_drill_grouping(out: List[str], pth, state: Any, peck=None
                     }
                 )
 
-            dg["pts"].append((par.get("X", state.get("X")), par.get("Y", state.get("Y"))))
+            dg["pts"].append((X, Y))
 
         else:
             # Keep going; don't hard-fail on unknown command
@@ -178,11 +275,15 @@ def _emit_literal_with_drill_grouping(out: List[str], pth, state: Any, peck=None
 
         # update modals
         if X is not None:
-            state["X"] = X
+            sx = X
         if Y is not None:
-            state["Y"] = Y
+            sy = Y
         if Z is not None:
-            state["Z"] = Z
+            sz = Z
+
+    state["X"] = sx
+    state["Y"] = sy
+    state["Z"] = sz
 
     if peck is not None:
         dg["peck"] = peck
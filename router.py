@@ -1,18 +1,49 @@
 # router.py - operation classification
 from __future__ import annotations
-import Path.Op.Profile
-from fc_adapter import scan_command_names
 
-DRILL_CMDS = {"G81","G82","G83","G73"}
+DRILL_CMDS = frozenset({"G81", "G82", "G83", "G73"})
+
+
+def is_profile(base):
+    """True if the operation's proxy is a Profile op.
+
+    Duck-typed on the class names in the proxy's MRO so we never import
+    Path.Op.Profile - loading that module just for one isinstance check
+    costs post-processor startup time. Scanning the MRO keeps the
+    isinstance semantics: subclasses of ObjectProfile still match.
+    """
+    proxy = getattr(base, "Proxy", None)
+    if proxy is None:
+        return False
+    return any(c.__name__ == "ObjectProfile" for c in type(proxy).__mro__)
+
 
 def classify(pth, base=None):
-    if base is not None and isinstance(getattr(base, "Proxy", None), Path.Op.Profile.ObjectProfile):
+    # Re-classifying the same path (previews, retries) repeats an O(n)
+    # command scan; cache the result on the path object where possible.
+    cached = getattr(pth, "_tnc_kind", None)
+    if cached is not None:
+        return cached
+
+    kind = _classify(pth, base)
+    try:
+        pth._tnc_kind = kind
+    except Exception:
+        # FreeCAD C++ objects may refuse new attributes; just re-scan then.
+        pass
+    return kind
+
+
+def _classify(pth, base):
+    if base is not None and is_profile(base):
         return "contour"
-    names = scan_command_names(pth)
-    if names & DRILL_CMDS:
-        return "drill"
-    # crude heuristic: if there are many commands and lots of Z variation -> 3d
+    # Single traversal: return as soon as a drill cycle shows up instead of
+    # collecting all names first and intersecting afterwards.
     cmds = getattr(pth, "Commands", []) or []
+    for c in cmds:
+        if str(getattr(c, "Name", "")).upper() in DRILL_CMDS:
+            return "drill"
+    # crude heuristic: if there are many commands and lots of Z variation -> 3d
     if len(cmds) > 500:
         return "3d"
     return "contour"
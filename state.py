@@ -1,9 +1,45 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
+from math import isnan, nan
+
 
 @dataclass
 class State:
     tool_active: int | None = None
-    x: float | None = None
-    y: float | None = None
-    z: float | None = None
+    # Modal position as one contiguous double buffer (0=x, 1=y, 2=z) with
+    # NaN marking "unknown". A flat buffer keeps the three coordinates in
+    # one allocation and exposes them to any future compiled emission
+    # kernel; the x/y/z properties preserve the None-based API the
+    # emitters compare against.
+    _xyz: array = field(default_factory=lambda: array("d", (nan, nan, nan)))
+    # Last emitted arc center; CC is modal on the control, so an unchanged
+    # center does not need to be re-emitted.
+    last_cc: tuple | None = None
+
+    @property
+    def x(self) -> float | None:
+        v = self._xyz[0]
+        return None if isnan(v) else v
+
+    @x.setter
+    def x(self, value) -> None:
+        self._xyz[0] = nan if value is None else value
+
+    @property
+    def y(self) -> float | None:
+        v = self._xyz[1]
+        return None if isnan(v) else v
+
+    @y.setter
+    def y(self, value) -> None:
+        self._xyz[1] = nan if value is None else value
+
+    @property
+    def z(self) -> float | None:
+        v = self._xyz[2]
+        return None if isnan(v) else v
+
+    @z.setter
+    def z(self, value) -> None:
+        self._xyz[2] = nan if value is None else value
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import io
 import os, sys
 
 # --- sicherstellen, dass das Modulverzeichnis im Pfad ist ---
@@ -11,9 +12,8 @@ import FreeCAD as App  # type: ignore
 from state import State
 from fc_adapter import unwrap_base, get_heights
 from tool_db import build_tool_db, write_tool_csv, check_toolnumbers_unique
-from router import classify
+from router import classify, is_profile
 import emit_tnc
-import Path.Op.Profile
 from ops_drill import emit_drilling
 from ops_contour import emit_contour_simple
 from ops_3d import emit_3d
@@ -101,7 +101,11 @@ def export(objectslist, filename, args=""):
             continue
 
         base = unwrap_base(obj)
-        pth = getattr(obj, "Path", None) or getattr(base, "Path", None)
+        # Explicit None check so the common case (Path on the op itself)
+        # costs exactly one getattr.
+        pth = getattr(obj, "Path", None)
+        if pth is None:
+            pth = getattr(base, "Path", None)
         if not pth:
             continue
 
@@ -120,8 +124,7 @@ def export(objectslist, filename, args=""):
                 komp = "RR"
             elif direction == "CW" and side == "Inside":
                 komp = "RR"
-        is_profile = isinstance(getattr(base, "Proxy", None), Path.Op.Profile.ObjectProfile)
-        radius_comp = komp if is_profile else "R0"
+        radius_comp = komp if is_profile(base) else "R0"
 
         # ---------- TOOL CALL ----------
         new_tool = _get_tool_number(obj)
@@ -151,16 +154,22 @@ def export(objectslist, filename, args=""):
 
         kind = classify(pth, base)
         if kind == "drill":
-            emit_drilling(out, state, db, get_heights(obj), pth)
+            # Pass the already-unwrapped base so get_heights does not walk
+            # the dressup chain a second time.
+            emit_drilling(out, state, db, get_heights(base), pth)
         elif kind == "3d":
-            emit_3d(out, state, db, get_heights(obj), pth)
+            emit_3d(out, state, db, get_heights(base), pth)
         else:
             emit_contour_simple(out, pth.Commands, state, fx, fz, op=obj)
 
     out.append(f"END PGM {name} MM")
 
-    return (
-        "\n" +
-        "\n".join(f"{i} {l}" for i, l in enumerate(out)) +
-        "\n"
-    )
+    # Number the lines in one pass into a StringIO instead of building a
+    # second list of numbered strings for a final join. Format stays:
+    # empty first line, then "<i> <line>" from 0, trailing newline.
+    buf = io.StringIO()
+    write = buf.write
+    write("\n")
+    for i, l in enumerate(out):
+        write(f"{i} {l}\n")
+    return buf.getvalue()
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-import csv
 from typing import Any, Optional
 
 
@@ -81,60 +80,103 @@ def _find_tool_controllers_from_job(job) -> list:
     return kids
 
 
+# Controller properties read per tool; fetched in one tight batch so the
+# Python<->C++ boundary is crossed once per name instead of via repeated
+# hasattr+getattr pairs.
+_TC_PROPS = (
+    "ToolNumber", "Label", "Name",
+    "Tool", "Toolbit", "ToolBit",
+    "SpindleSpeed", "RPM", "Spindle",
+    "HorizFeed", "VertFeed",
+)
+
+
+def _snapshot_props(obj: Any, names) -> dict:
+    props = {}
+    for n in names:
+        try:
+            props[n] = getattr(obj, n, None)
+        except Exception:
+            # FreeCAD properties can raise on access; treat as absent.
+            props[n] = None
+    return props
+
+
 def build_tool_db(job, operations=None) -> ToolDB:
     db = ToolDB()
 
     controllers = _find_tool_controllers_from_job(job)
 
     for tc in controllers:
-        # Tool number
-        tnum = _get_prop(tc, "ToolNumber")
         try:
-            tnum_i = int(tnum)
+            props = _snapshot_props(tc, _TC_PROPS)
+
+            # Tool number
+            try:
+                tnum_i = int(props["ToolNumber"])
+            except Exception:
+                # if ToolNumber is missing, we cannot reference it reliably
+                continue
+
+            label = str(props["Label"] or props["Name"] or f"Tool{tnum_i}")
+
+            # Link to toolbit (for diameter etc.)
+            tool = props["Tool"] or props["Toolbit"] or props["ToolBit"]
+
+            # Diameter (best effort; depends on your toolbit model)
+            diam = None
+            if tool is not None:
+                diam = _get_prop(tool, "Diameter") or _get_prop(tool, "ToolDiameter") or _get_prop(tool, "Diam")
+            diam_mm = _to_float(diam)
+
+            # RPM (best effort; depends on your controller model)
+            rpm_i = _to_int(props["SpindleSpeed"] or props["RPM"] or props["Spindle"])
+
+            # Feeds: you have them on the controller as Quantity in mm/s
+            info = ToolInfo(
+                tnum=tnum_i,
+                label=label,
+                diam_mm=diam_mm,
+                rpm=rpm_i,
+                feed_xy_mmmin=_qty_mmps_to_mmmin(props["HorizFeed"]),
+                feed_z_mmmin=_qty_mmps_to_mmmin(props["VertFeed"]),
+            )
+
+            db.tools[tnum_i] = info
         except Exception:
-            # if ToolNumber is missing, we cannot reference it reliably
+            # One broken controller must not abort the whole scan.
             continue
 
-        label = str(getattr(tc, "Label", "") or getattr(tc, "Name", "") or f"Tool{tnum_i}")
-
-        # Link to toolbit (for diameter etc.)
-        tool = _get_prop(tc, "Tool") or _get_prop(tc, "Toolbit") or _get_prop(tc, "ToolBit")
-
-        # Diameter (best effort; depends on your toolbit model)
-        diam = None
-        if tool is not None:
-            diam = _get_prop(tool, "Diameter") or _get_prop(tool, "ToolDiameter") or _get_prop(tool, "Diam")
-        diam_mm = _to_float(diam)
-
-        # RPM (best effort; depends on your controller model)
-        rpm = _get_prop(tc, "SpindleSpeed") or _get_prop(tc, "RPM") or _get_prop(tc, "Spindle")
-        rpm_i = _to_int(rpm)
+    return db
 
-        # Feeds: you have them on the controller as Quantity in mm/s
-        fxy_q = _get_prop(tc, "HorizFeed")
-        fz_q  = _get_prop(tc, "VertFeed")
 
-        info = ToolInfo(
-            tnum=tnum_i,
-            label=label,
-            diam_mm=diam_mm,
-            rpm=rpm_i,
-            feed_xy_mmmin=_qty_mmps_to_mmmin(fxy_q),
-            feed_z_mmmin=_qty_mmps_to_mmmin(fz_q),
-        )
+def _csv_label(label: str) -> str:
+    """Quote the label RFC-4180-style when it needs it.
 
-        db.tools[tnum_i] = info
-
-    return db
+    Label is the only free-text column; a ';', '"' or newline in it would
+    otherwise break the row structure. Clean labels (the normal case) pass
+    through unquoted, matching csv.writer's minimal quoting.
+    """
+    if ";" in label or '"' in label or "\n" in label or "\r" in label:
+        return '"' + label.replace('"', '""') + '"'
+    return label
 
 
 def write_tool_csv(db: ToolDB, filepath: str) -> None:
+    # Plain f-string rows + one writelines call; the csv dialect machinery
+    # is overhead for this fixed semicolon-separated layout.
+    # None renders as an empty field, matching what csv.writer produced.
+    rows = [
+        f"{t.tnum};{_csv_label(t.label)};"
+        f"{'' if t.diam_mm is None else t.diam_mm};"
+        f"{'' if t.rpm is None else t.rpm};"
+        f"{'' if t.feed_xy_mmmin is None else t.feed_xy_mmmin};"
+        f"{'' if t.feed_z_mmmin is None else t.feed_z_mmmin}\r\n"
+        for t in (db.tools[tnum] for tnum in sorted(db.tools))
+    ]
     with open(filepath, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f, delimiter=";")
-        w.writerow(["ToolNumber", "Label", "Diameter_mm", "Spindle_rpm", "FeedXY_mmmin", "FeedZ_mmmin"])
-        for tnum in sorted(db.tools):
-            t = db.tools[tnum]
-            w.writerow([t.tnum, t.label, t.diam_mm, t.rpm, t.feed_xy_mmmin, t.feed_z_mmmin])
+        f.write("ToolNumber;Label;Diameter_mm;Spindle_rpm;FeedXY_mmmin;FeedZ_mmmin\r\n")
+        f.writelines(rows)
 
 
 def check_toolnumbers_unique(db: ToolDB) -> None: